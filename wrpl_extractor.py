@@ -8,18 +8,38 @@ using a structured approach that mirrors the C++ implementation.
 
 import argparse
 import json
+import mmap
 import struct
 import subprocess
 import sys
+import threading
 import traceback
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any, Tuple, BinaryIO
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Any, Tuple, BinaryIO, Union
 import logging
 from enum import IntEnum
 
+try:
+    import orjson  # Optional: much faster JSON decoding/encoding
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl  # Optional: used to enlarge subprocess pipes on Linux
+except ImportError:
+    fcntl = None
+
+
+_LOG = logging.getLogger(__name__)
+
+# ProcessPoolExecutor rejects more workers than this on Windows
+_MAX_WINDOWS_WORKERS = 61
+
 
 # ============================================================================
 # Enums and Constants (from constants.h)
@@ -32,11 +52,72 @@ class Difficulty(IntEnum):
     SIMULATOR = 10
 
 
+_DIFFICULTY_MAP = {0: Difficulty.ARCADE, 5: Difficulty.REALISTIC, 10: Difficulty.SIMULATOR}
+# Difficulty for every 4-bit value; unknown values are ARCADE
+_DIFFICULTY_TABLE = tuple(_DIFFICULTY_MAP.get(value, Difficulty.ARCADE) for value in range(16))
+
+# Display names (like difficultyToString)
+_DIFFICULTY_NAMES = {
+    Difficulty.ARCADE: "ARCADE",
+    Difficulty.REALISTIC: "REALISTIC",
+    Difficulty.SIMULATOR: "SIMULATOR"
+}
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode UTF-8 JSON bytes (uses orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode data as indented UTF-8 JSON (uses orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _write_atomic(output_file: Path, data: bytes) -> None:
+    """Write data in one call via a temp file so readers never see partial output"""
+    tmp_file = output_file.with_suffix(output_file.suffix + '.tmp')
+    try:
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: int) -> str:
+    """Format a Unix timestamp as local date and time (memoized across replays)"""
+    dt = datetime.fromtimestamp(timestamp)
+    # Plain integer formatting avoids the locale-aware strftime machinery
+    return (f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}")
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Dataclass field names, computed once per class"""
+    return tuple(f.name for f in fields(cls))
+
+
+def _shallow_dict(obj: Any) -> Dict[str, Any]:
+    """Shallow field dict for serialization (asdict's deep copy is unneeded)"""
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+
 # ============================================================================
 # Data Classes (from C++ structs/classes)
 # ============================================================================
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Position:
     """Represents a map position (from position.h)"""
     x: float = -1.0
@@ -75,7 +156,7 @@ class Position:
         return 0.0 <= self.x <= 1.0 and 0.0 <= self.y <= 1.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CraftInfo:
     """Aircraft/vehicle information (from craftinfo.h)"""
     name: str = ""
@@ -95,7 +176,7 @@ class CraftInfo:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Player:
     """Player information (from player.h)"""
     user_id: str = ""
@@ -131,7 +212,28 @@ class Player:
         )
 
 
-@dataclass
+# PlayerReplayData integer fields and their BLK JSON keys
+_PLAYER_INT_FIELDS = (
+    ('squad', 'squadId'),
+    ('team', 'team'),
+    ('kills', 'kills'),
+    ('ground_kills', 'groundKills'),
+    ('naval_kills', 'navalKills'),
+    ('team_kills', 'teamKills'),
+    ('ai_kills', 'aiKills'),
+    ('ai_ground_kills', 'aiGroundKills'),
+    ('ai_naval_kills', 'aiNavalKills'),
+    ('assists', 'assists'),
+    ('deaths', 'deaths'),
+    ('capture_zone', 'captureZone'),
+    ('damage_zone', 'damageZone'),
+    ('score', 'score'),
+    ('award_damage', 'awardDamage'),
+    ('missile_evades', 'missileEvades'),
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PlayerReplayData:
     """Player statistics from replay (from playerreplaydata.h)"""
     user_id: str = ""
@@ -157,40 +259,18 @@ class PlayerReplayData:
     
     @classmethod
     def from_json(cls, json_data: Dict[str, Any]) -> 'PlayerReplayData':
-        def get_int(key: str, default: int = 0) -> int:
+        # Single pass over a static field table; non-numeric values default to 0
+        int_values = {}
+        for field_name, key in _PLAYER_INT_FIELDS:
             value = json_data.get(key)
-            if isinstance(value, (int, float)):
-                return int(value)
-            return default
+            int_values[field_name] = int(value) if isinstance(value, (int, float)) else 0
         
-        def get_bool(key: str, default: bool = False) -> bool:
-            value = json_data.get(key)
-            if isinstance(value, bool):
-                return value
-            return default
-        
-        def get_string(key: str, default: str = "") -> str:
-            return str(json_data.get(key, default))
+        auto_squad = json_data.get("autoSquad")
         
         return cls(
-            user_id=get_string("userId", ""),
-            squad=get_int("squadId", 0),
-            auto_squad=get_bool("autoSquad", False),
-            team=get_int("team", 0),
-            kills=get_int("kills", 0),
-            ground_kills=get_int("groundKills", 0),
-            naval_kills=get_int("navalKills", 0),
-            team_kills=get_int("teamKills", 0),
-            ai_kills=get_int("aiKills", 0),
-            ai_ground_kills=get_int("aiGroundKills", 0),
-            ai_naval_kills=get_int("aiNavalKills", 0),
-            assists=get_int("assists", 0),
-            deaths=get_int("deaths", 0),
-            capture_zone=get_int("captureZone", 0),
-            damage_zone=get_int("damageZone", 0),
-            score=get_int("score", 0),
-            award_damage=get_int("awardDamage", 0),
-            missile_evades=get_int("missileEvades", 0)
+            user_id=str(json_data.get("userId", "")),
+            auto_squad=auto_squad if isinstance(auto_squad, bool) else False,
+            **int_values
         )
 
 
@@ -198,7 +278,7 @@ class PlayerReplayData:
 # Replay Header Structure (from replay.h and 010 Editor template)
 # ============================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ReplayHeader:
     """WRPL file header structure (matches C++ and 010 Editor template)"""
     # Magic number (0x10AC00E5 in little endian)
@@ -239,8 +319,7 @@ class ReplayHeader:
     def __post_init__(self):
         if self.start_time:
             try:
-                dt = datetime.fromtimestamp(self.start_time)
-                self.start_time_readable = dt.strftime('%Y-%m-%d %H:%M:%S')
+                self.start_time_readable = _format_timestamp(self.start_time)
             except (ValueError, OSError):
                 self.start_time_readable = f"Invalid timestamp: {self.start_time}"
 
@@ -249,12 +328,15 @@ class ReplayHeader:
 # Replay Data (Main container class)
 # ============================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ReplayData:
     """Complete replay data container (from replay.h)"""
     # Header information
     header: ReplayHeader
     
+    # Only the header was parsed; results, players and BLK data are not set
+    header_only: bool = False
+    
     # Results/BLK data
     status: str = "left"
     time_played: float = 0.0
@@ -273,32 +355,177 @@ class ReplayData:
 # Parser Classes
 # ============================================================================
 
+class BlkUnpacker:
+    """Converts raw BLK data to JSON using the wt_ext_cli tool"""
+    
+    TIMEOUT = 30              # seconds per BLK blob
+    READ_CHUNK = 1 << 20      # bytes per stdout read
+    PIPE_SIZE = 1 << 20       # requested kernel pipe capacity (Linux)
+    
+    def __init__(self, wt_ext_cli_path: Path):
+        # Validated once here rather than stat-ing the tool for every replay
+        if not wt_ext_cli_path.is_file():
+            raise FileNotFoundError(
+                f"wt_ext_cli not found at {wt_ext_cli_path}\n"
+                f"Download from: https://github.com/Warthunder-Open-Source-Foundation/wt_ext_cli"
+            )
+        if not os.access(wt_ext_cli_path, os.X_OK):
+            raise PermissionError(f"wt_ext_cli is not executable: {wt_ext_cli_path}")
+        
+        self.wt_ext_cli_path = wt_ext_cli_path
+        
+        # Command line is fixed for the lifetime of the unpacker (like C++ code)
+        self._cmd = [
+            str(wt_ext_cli_path),
+            '--unpack_raw_blk',
+            '--stdout',
+            '--stdin',
+            '--format', 'Json'
+        ]
+    
+    def unpack(self, blk_data: Union[bytes, memoryview]) -> Dict[str, Any]:
+        """Run wt_ext_cli on a BLK blob and return the decoded JSON"""
+        try:
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug("Running command: %s", ' '.join(self._cmd))
+            
+            returncode, stdout, stderr = self._run(blk_data)
+            
+            if returncode != 0:
+                _LOG.warning("wt_ext_cli returned exit code %d", returncode)
+                if stderr and _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("stderr: %s", stderr.decode('utf-8', errors='ignore'))
+                return {}
+            
+            # Parse JSON output (decoded straight from bytes)
+            json_data = _json_loads(stdout)
+            return json_data
+            
+        except subprocess.TimeoutExpired:
+            _LOG.warning("BLK parsing timed out")
+            return {}
+        except json.JSONDecodeError as e:
+            _LOG.warning("Failed to parse JSON: %s", e)
+            return {}
+    
+    def _run(self, blk_data: Union[bytes, memoryview]) -> Tuple[int, bytearray, bytes]:
+        """Run wt_ext_cli, streaming stdout into a single growing buffer
+        
+        Unlike communicate(), stdout is read here directly into one bytearray
+        that is handed to the JSON parser as-is, while stdin is fed and stderr
+        drained on helper threads so none of the pipes can block.
+        """
+        process = subprocess.Popen(
+            self._cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=self.PIPE_SIZE,
+            text=False
+        )
+        self._grow_pipes(process)
+        
+        timed_out = threading.Event()
+        
+        def on_timeout() -> None:
+            timed_out.set()
+            process.kill()
+        
+        stderr_chunks: List[bytes] = []
+        writer = threading.Thread(target=self._feed_stdin, args=(process.stdin, blk_data),
+                                  daemon=True)
+        err_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()),
+                                      daemon=True)
+        watchdog = threading.Timer(self.TIMEOUT, on_timeout)
+        
+        try:
+            writer.start()
+            err_reader.start()
+            watchdog.start()
+            
+            stdout = bytearray()
+            while True:
+                chunk = process.stdout.read1(self.READ_CHUNK)
+                if not chunk:
+                    break
+                stdout += chunk
+            
+            writer.join()
+            err_reader.join()
+            returncode = process.wait()
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(self._cmd, self.TIMEOUT)
+        
+        return returncode, stdout, b''.join(stderr_chunks)
+    
+    @classmethod
+    def _grow_pipes(cls, process: subprocess.Popen) -> None:
+        """Raise the stdin/stdout pipe capacity so large blobs need fewer syscalls"""
+        if fcntl is None or not sys.platform.startswith('linux'):
+            return
+        
+        set_pipe_size = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+        for pipe in (process.stdin, process.stdout):
+            try:
+                fcntl.fcntl(pipe.fileno(), set_pipe_size, cls.PIPE_SIZE)
+            except OSError:
+                # Above /proc/sys/fs/pipe-max-size; keep the default capacity
+                pass
+    
+    @staticmethod
+    def _feed_stdin(pipe: BinaryIO, data: Union[bytes, memoryview]) -> None:
+        """Write data to the child's stdin and close it"""
+        try:
+            with pipe:
+                pipe.write(data)
+        except BrokenPipeError:
+            # wt_ext_cli exited without consuming all input; its exit code tells why
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_blk_unpacker(wt_ext_cli_path: Path) -> BlkUnpacker:
+    """Return the unpacker for this process, creating it on first use"""
+    return BlkUnpacker(wt_ext_cli_path)
+
+
 class ReplayParser:
     """Parses WRPL files following the C++ structure"""
     
     # Constants from replay.h
     MAGIC = b'\xe5\xac\x00\x10'
     
-    # String field sizes (in bytes)
-    STRING_SIZES = {
-        'level': 128,
-        'level_settings': 260,
-        'battle_type': 128,
-        'environment': 128,
-        'visibility': 32,
-        'loc_name': 128,
-        'battle_class': 128,
-        'battle_kill_streak': 128
-    }
+    # Fixed header layout (replay.h), decoded in a single C-level unpack:
+    #   magic, version, level[128], level_settings[260], battle_type[128],
+    #   environment[128], visibility[32], rez_offset, difficulty, pad[35],
+    #   session_type, pad[7], session_id (u64), pad[4], m_set_size, pad[32],
+    #   loc_name[128], start_time, time_limit, score_limit, pad[48],
+    #   battle_class[128], battle_kill_streak[128]
+    HEADER_STRUCT = struct.Struct('<4sI128s260s128s128s32sIB35xI7xQ4xI32x128sIII48x128s128s')
+    # Shorter headers still parse up to score_limit; a cut-off battle_class or
+    # battle_kill_streak reads as empty, like the C++ readString
+    BATTLE_CLASS_END = HEADER_STRUCT.size - 128
+    MIN_HEADER_SIZE = BATTLE_CLASS_END - 128 - 48
     
     def __init__(self, file_path: Path, wt_ext_cli_path: Path):
         self.file_path = file_path
         self.wt_ext_cli_path = wt_ext_cli_path
-        self.logger = logging.getLogger(__name__)
         self._buffer = b''
         
-    def parse(self) -> Optional[ReplayData]:
-        """Parse the WRPL file and return ReplayData"""
+    def parse(self, needs_blk: bool = True) -> Optional[ReplayData]:
+        """Parse the WRPL file and return ReplayData
+        
+        With needs_blk=False only the header is read; wt_ext_cli is not run and
+        the returned ReplayData is marked header_only.
+        """
         try:
             # Read file content
             self._read_file()
@@ -306,6 +533,9 @@ class ReplayParser:
             # Parse header
             header = self._parse_header()
             
+            if not needs_blk:
+                return ReplayData(header=header, header_only=True)
+            
             # Parse BLK data (results section)
             blk_data = self._parse_blk_data(header.rez_offset)
             
@@ -315,107 +545,63 @@ class ReplayParser:
             return replay_data
             
         except Exception as e:
-            self.logger.error(f"Failed to parse {self.file_path.name}: {e}")
-            self.logger.debug(f"Traceback:\n{traceback.format_exc()}")
+            _LOG.error("Failed to parse %s: %s", self.file_path.name, e)
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug("Traceback:\n%s", traceback.format_exc())
             return None
+        
+        finally:
+            self._close_file()
     
     def _read_file(self) -> None:
-        """Read entire file into buffer"""
+        """Memory-map the file into buffer (pages are loaded on demand)"""
         with open(self.file_path, 'rb') as f:
-            self._buffer = f.read()
+            # Reject non-replay files before mapping or parsing anything
+            magic = f.read(4)
+            if magic != self.MAGIC:
+                raise ValueError(f"Invalid magic number: {magic.hex()}")
+            
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _close_file(self) -> None:
+        """Release the file mapping"""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
     
     def _parse_header(self) -> ReplayHeader:
         """Parse the structured header from binary content"""
+        # Magic was already validated by _read_file
         buffer = self._buffer
-        offset = 0
-        
-        # Check magic
-        magic = buffer[offset:offset+4]
-        if magic != self.MAGIC:
-            raise ValueError(f"Invalid magic number: {magic.hex()}")
-        offset += 4
-        
-        # Parse fixed-size fields
-        version = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
-        
-        # Parse string fields
-        level = self._read_string(buffer, offset, self.STRING_SIZES['level'])
-        offset += self.STRING_SIZES['level']
-        
-        level_settings = self._read_string(buffer, offset, self.STRING_SIZES['level_settings'])
-        offset += self.STRING_SIZES['level_settings']
-        
-        battle_type = self._read_string(buffer, offset, self.STRING_SIZES['battle_type'])
-        offset += self.STRING_SIZES['battle_type']
-        
-        environment = self._read_string(buffer, offset, self.STRING_SIZES['environment'])
-        offset += self.STRING_SIZES['environment']
-        
-        visibility = self._read_string(buffer, offset, self.STRING_SIZES['visibility'])
-        offset += self.STRING_SIZES['visibility']
-        
-        # Parse rez_offset
-        rez_offset = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
-        
-        # Parse difficulty (bitfield)
-        difficulty_raw = buffer[offset]
-        difficulty_value = difficulty_raw & 0x0F
-        difficulty = self._parse_difficulty(difficulty_value)
-        offset += 1
-        
-        # Skip padding (35 bytes as per C++ code)
-        offset += 35
+        if self.MIN_HEADER_SIZE <= len(buffer) < self.HEADER_STRUCT.size:
+            # Keep only complete trailing fields and zero-fill the rest
+            if len(buffer) >= self.BATTLE_CLASS_END:
+                complete = self.BATTLE_CLASS_END
+            else:
+                complete = self.MIN_HEADER_SIZE
+            buffer = bytes(buffer[:complete]).ljust(self.HEADER_STRUCT.size, b'\x00')
         
-        # Parse session type
-        session_type = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
+        (magic, version, level, level_settings, battle_type, environment, visibility,
+         rez_offset, difficulty_raw, session_type, session_id_int, m_set_size,
+         loc_name, start_time, time_limit, score_limit, battle_class,
+         battle_kill_streak) = self.HEADER_STRUCT.unpack_from(buffer, 0)
         
-        # Skip padding (7 bytes as per C++ code)
-        offset += 7
+        # Decode string fields
+        level = self._read_string(level)
+        level_settings = self._read_string(level_settings)
+        battle_type = self._read_string(battle_type)
+        environment = self._read_string(environment)
+        visibility = self._read_string(visibility)
+        loc_name = self._read_string(loc_name)
+        battle_class = self._read_string(battle_class)
+        battle_kill_streak = self._read_string(battle_kill_streak)
         
-        # Parse session ID
-        session_id_int = struct.unpack_from('<Q', buffer, offset)[0]
+        # Difficulty is the low nibble of a bitfield
+        difficulty = self._parse_difficulty(difficulty_raw & 0x0F)
         session_id = hex(session_id_int)
-        offset += 8
-        
-        # Skip padding (4 bytes as per C++ code)
-        offset += 4
-        
-        # Parse m_set_size
-        m_set_size = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
-        
-        # Skip padding (32 bytes as per C++ code)
-        offset += 32
-        
-        # Parse loc_name
-        loc_name = self._read_string(buffer, offset, self.STRING_SIZES['loc_name'])
-        offset += self.STRING_SIZES['loc_name']
-        
-        # Parse timestamps and limits
-        start_time = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
-        
-        time_limit = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
-        
-        score_limit = struct.unpack_from('<I', buffer, offset)[0]
-        offset += 4
-        
-        # Skip padding (48 bytes as per C++ code)
-        offset += 48
-        
-        # Parse final string fields
-        battle_class = self._read_string(buffer, offset, self.STRING_SIZES['battle_class'])
-        offset += self.STRING_SIZES['battle_class']
-        
-        battle_kill_streak = self._read_string(buffer, offset, self.STRING_SIZES['battle_kill_streak'])
-        offset += self.STRING_SIZES['battle_kill_streak']
         
         # Clean up level string (remove paths and extensions like C++ code)
-        level = level.replace("levels/", "").replace(".bin", "")
+        level = level.removeprefix("levels/").removesuffix(".bin")
         
         # Create header object
         return ReplayHeader(
@@ -446,57 +632,13 @@ class ReplayParser:
     def _parse_blk_data(self, rez_offset: int) -> Dict[str, Any]:
         """Parse BLK data using wt_ext_cli tool"""
         if rez_offset <= 0 or rez_offset >= len(self._buffer):
-            self.logger.warning(f"Invalid rez_offset: {rez_offset}")
+            _LOG.warning("Invalid rez_offset: %d", rez_offset)
             return {}
         
-        # Extract BLK data from buffer
-        blk_data = self._buffer[rez_offset:]
-        
-        if not self.wt_ext_cli_path.exists():
-            raise FileNotFoundError(
-                f"wt_ext_cli not found at {self.wt_ext_cli_path}\n"
-                f"Download from: https://github.com/Warthunder-Open-Source-Foundation/wt_ext_cli"
-            )
-        
-        try:
-            # Prepare command (similar to C++ code)
-            cmd = [
-                str(self.wt_ext_cli_path),
-                '--unpack_raw_blk',
-                '--stdout',
-                '--stdin',
-                '--format', 'Json'
-            ]
-            
-            self.logger.debug(f"Running command: {' '.join(cmd)}")
-            
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=False
-            )
-            
-            stdout, stderr = process.communicate(input=blk_data, timeout=30)
-            
-            if process.returncode != 0:
-                self.logger.warning(f"wt_ext_cli returned exit code {process.returncode}")
-                if stderr:
-                    stderr_text = stderr.decode('utf-8', errors='ignore')
-                    self.logger.debug(f"stderr: {stderr_text}")
-                return {}
-            
-            # Parse JSON output
-            json_data = json.loads(stdout.decode('utf-8'))
-            return json_data
-            
-        except subprocess.TimeoutExpired:
-            self.logger.warning("BLK parsing timed out")
-            return {}
-        except json.JSONDecodeError as e:
-            self.logger.warning(f"Failed to parse JSON: {e}")
-            return {}
+        # Pipe a view of the mapped BLK section to wt_ext_cli without copying it.
+        # Views are released here so the mapping can be closed afterwards.
+        with memoryview(self._buffer) as view, view[rez_offset:] as blk_data:
+            return get_blk_unpacker(self.wt_ext_cli_path).unpack(blk_data)
     
     def _create_replay_data(self, header: ReplayHeader, blk_data: Dict[str, Any]) -> ReplayData:
         """Create ReplayData from header and BLK data (like C++ parseResults)"""
@@ -520,15 +662,16 @@ class ReplayParser:
         # Convert players_info_object to list for easier iteration
         players_info_list = players_info_object.values() if isinstance(players_info_object, dict) else []
         
+        # Index player info by id once (first entry wins, as with a linear search)
+        info_by_id = {}
+        for info in players_info_list:
+            info_by_id.setdefault(str(info.get("id", "")), info)
+        
         for player_obj in players_array:
             player_user_id = str(player_obj.get("userId", ""))
             
             # Find matching player info
-            player_info = None
-            for info in players_info_list:
-                if str(info.get("id", "")) == player_user_id:
-                    player_info = info
-                    break
+            player_info = info_by_id.get(player_user_id)
             
             if player_info:
                 # Create Player object
@@ -542,15 +685,11 @@ class ReplayParser:
                 
                 # Parse crafts/lineup
                 crafts = player_info.get("crafts", {})
-                lineup = []
-                for craft_key in crafts:
-                    craft_value = crafts[craft_key]
-                    if isinstance(craft_value, str):
-                        lineup.append(craft_value)
-                    elif isinstance(craft_value, dict) and "name" in craft_value:
-                        lineup.append(craft_value["name"])
-                
-                player_replay_data.lineup = lineup
+                player_replay_data.lineup = [
+                    craft if isinstance(craft, str) else craft["name"]
+                    for craft in crafts.values()
+                    if isinstance(craft, str) or (isinstance(craft, dict) and "name" in craft)
+                ]
                 
                 # Add to players list
                 players.append((player, player_replay_data))
@@ -567,46 +706,16 @@ class ReplayParser:
         )
     
     @staticmethod
-    def _read_string(buffer: bytes, offset: int, length: int) -> str:
-        """Read a null-terminated string from buffer (like C++ readString)"""
-        if offset + length > len(buffer):
-            return ""
-        
-        data = buffer[offset:offset+length]
-        null_index = data.find(b'\x00')
-        if null_index != -1:
-            data = data[:null_index]
-        
-        try:
-            return data.decode('utf-8')
-        except UnicodeDecodeError:
-            # Try other encodings if UTF-8 fails
-            try:
-                return data.decode('latin-1')
-            except UnicodeDecodeError:
-                return data.decode('utf-8', errors='ignore')
+    def _read_string(data: bytes) -> str:
+        """Decode a fixed-size null-terminated string field (like C++ readString)"""
+        # partition() finds the terminator and slices in one step; invalid
+        # UTF-8 bytes become U+FFFD instead of going through fallback decoders
+        return data.partition(b'\x00')[0].decode('utf-8', errors='replace')
     
     @staticmethod
     def _parse_difficulty(value: int) -> Difficulty:
-        """Parse difficulty value (bitfield handling like C++)"""
-        # Map difficulty values (from constants.h)
-        difficulty_map = {
-            0: Difficulty.ARCADE,
-            5: Difficulty.REALISTIC,
-            10: Difficulty.SIMULATOR
-        }
-        
-        # Try to find exact match first
-        if value in difficulty_map:
-            return difficulty_map[value]
-        
-        # Fallback: find closest match
-        for diff_value, diff_enum in difficulty_map.items():
-            if value == diff_value:
-                return diff_enum
-        
-        # Default to ARCADE if unknown
-        return Difficulty.ARCADE
+        """Parse the 4-bit difficulty value (masked by the caller, like C++)"""
+        return _DIFFICULTY_TABLE[value]
 
 
 # ============================================================================
@@ -619,12 +728,7 @@ class Utils:
     @staticmethod
     def difficulty_to_string(difficulty: Difficulty) -> str:
         """Convert Difficulty enum to string (like difficultyToString)"""
-        mapping = {
-            Difficulty.ARCADE: "ARCADE",
-            Difficulty.REALISTIC: "REALISTIC",
-            Difficulty.SIMULATOR: "SIMULATOR"
-        }
-        return mapping.get(difficulty, "UNKNOWN")
+        return _DIFFICULTY_NAMES.get(difficulty, "UNKNOWN")
     
     @staticmethod
     def replay_length_to_string(seconds: int) -> str:
@@ -650,7 +754,6 @@ class ReplayExporter:
     
     def __init__(self, output_format: str = 'json'):
         self.output_format = output_format
-        self.logger = logging.getLogger(__name__)
     
     def export(self, replay_data: ReplayData, output_file: Path) -> bool:
         """Export replay data to file"""
@@ -664,126 +767,135 @@ class ReplayExporter:
             else:
                 raise ValueError(f"Unsupported format: {self.output_format}")
         except Exception as e:
-            self.logger.error(f"Export failed: {e}")
+            _LOG.error("Export failed: %s", e)
             return False
     
     def _export_json(self, replay_data: ReplayData, output_file: Path) -> bool:
         """Export as JSON"""
         # Convert to dict
-        data_dict = {
-            'header': asdict(replay_data.header),
-            'status': replay_data.status,
-            'time_played': replay_data.time_played,
-            'author_user_id': replay_data.author_user_id,
-            'author': replay_data.author,
-            'players': self._players_to_dict(replay_data.players),
-            'blk_data': replay_data.blk_data
-        }
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, indent=2, ensure_ascii=False, default=str)
+        data_dict = {'header': _shallow_dict(replay_data.header)}
+        if not replay_data.header_only:
+            data_dict.update({
+                'status': replay_data.status,
+                'time_played': replay_data.time_played,
+                'author_user_id': replay_data.author_user_id,
+                'author': replay_data.author,
+                'players': self._players_to_dict(replay_data.players),
+                'blk_data': replay_data.blk_data
+            })
+        
+        _write_atomic(output_file, _json_dumps(data_dict))
         
         return True
     
     def _export_text(self, replay_data: ReplayData, output_file: Path) -> bool:
         """Export as human-readable text"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"War Thunder Replay Analysis\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Header info
-            f.write("[ HEADER INFORMATION ]\n")
-            f.write("-" * 80 + "\n")
-            header = replay_data.header
-            f.write(f"File: {header.file_name} ({header.file_size:,} bytes)\n")
-            f.write(f"Version: {header.version}\n")
-            f.write(f"Map: {header.level}\n")
-            f.write(f"Battle Type: {header.battle_type}\n")
-            f.write(f"Difficulty: {Utils.difficulty_to_string(header.difficulty)} ({header.difficulty_raw})\n")
-            f.write(f"Session ID: {header.session_id}\n")
-            f.write(f"Start Time: {header.start_time_readable} ({header.start_time})\n")
-            f.write(f"Time Limit: {Utils.replay_length_to_string(header.time_limit)}\n")
-            f.write(f"Score Limit: {header.score_limit}\n")
-            f.write(f"Location: {header.loc_name}\n")
-            f.write(f"Battle Class: {header.battle_class}\n")
-            
-            # Replay info
-            f.write(f"\n[ REPLAY INFORMATION ]\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Status: {replay_data.status}\n")
-            f.write(f"Time Played: {replay_data.time_played:.1f}s\n")
-            f.write(f"Author: {replay_data.author} (ID: {replay_data.author_user_id})\n")
-            
-            # Players
-            f.write(f"\n[ PLAYERS ({len(replay_data.players)}) ]\n")
-            f.write("-" * 80 + "\n")
-            
-            for idx, (player, player_data) in enumerate(replay_data.players, 1):
-                f.write(f"\nPlayer {idx}: {player.username} (ID: {player.user_id})\n")
-                f.write(f"  Squadron: {player.squadron_tag} (ID: {player.squadron_id})\n")
-                f.write(f"  Platform: {player.platform}\n")
-                f.write(f"  Team: {player_data.team}, Squad: {player_data.squad}\n")
-                f.write(f"  Kills: {player_data.kills} (Air: {player_data.kills}, Ground: {player_data.ground_kills}, Naval: {player_data.naval_kills})\n")
-                f.write(f"  AI Kills: Air={player_data.ai_kills}, Ground={player_data.ai_ground_kills}, Naval={player_data.ai_naval_kills}\n")
-                f.write(f"  Deaths: {player_data.deaths}, Assists: {player_data.assists}, Team Kills: {player_data.team_kills}\n")
-                f.write(f"  Score: {player_data.score}, Capture Zones: {player_data.capture_zone}\n")
-                f.write(f"  Lineup: {', '.join(player_data.lineup[:3])}" + 
-                       (f" (+{len(player_data.lineup)-3} more)" if len(player_data.lineup) > 3 else "") + "\n")
+        parts: List[str] = []
+        parts.append("=" * 80 + "\n")
+        parts.append(f"War Thunder Replay Analysis\n")
+        parts.append("=" * 80 + "\n\n")
+        
+        # Header info
+        parts.append("[ HEADER INFORMATION ]\n")
+        parts.append("-" * 80 + "\n")
+        header = replay_data.header
+        parts.append(f"File: {header.file_name} ({header.file_size:,} bytes)\n")
+        parts.append(f"Version: {header.version}\n")
+        parts.append(f"Map: {header.level}\n")
+        parts.append(f"Battle Type: {header.battle_type}\n")
+        parts.append(f"Difficulty: {Utils.difficulty_to_string(header.difficulty)} ({header.difficulty_raw})\n")
+        parts.append(f"Session ID: {header.session_id}\n")
+        parts.append(f"Start Time: {header.start_time_readable} ({header.start_time})\n")
+        parts.append(f"Time Limit: {Utils.replay_length_to_string(header.time_limit)}\n")
+        parts.append(f"Score Limit: {header.score_limit}\n")
+        parts.append(f"Location: {header.loc_name}\n")
+        parts.append(f"Battle Class: {header.battle_class}\n")
+        
+        if replay_data.header_only:
+            _write_atomic(output_file, "".join(parts).encode('utf-8'))
+            return True
+        
+        # Replay info
+        parts.append(f"\n[ REPLAY INFORMATION ]\n")
+        parts.append("-" * 80 + "\n")
+        parts.append(f"Status: {replay_data.status}\n")
+        parts.append(f"Time Played: {replay_data.time_played:.1f}s\n")
+        parts.append(f"Author: {replay_data.author} (ID: {replay_data.author_user_id})\n")
+        
+        # Players
+        parts.append(f"\n[ PLAYERS ({len(replay_data.players)}) ]\n")
+        parts.append("-" * 80 + "\n")
         
+        for idx, (player, player_data) in enumerate(replay_data.players, 1):
+            parts.append(f"\nPlayer {idx}: {player.username} (ID: {player.user_id})\n")
+            parts.append(f"  Squadron: {player.squadron_tag} (ID: {player.squadron_id})\n")
+            parts.append(f"  Platform: {player.platform}\n")
+            parts.append(f"  Team: {player_data.team}, Squad: {player_data.squad}\n")
+            parts.append(f"  Kills: {player_data.kills} (Air: {player_data.kills}, Ground: {player_data.ground_kills}, Naval: {player_data.naval_kills})\n")
+            parts.append(f"  AI Kills: Air={player_data.ai_kills}, Ground={player_data.ai_ground_kills}, Naval={player_data.ai_naval_kills}\n")
+            parts.append(f"  Deaths: {player_data.deaths}, Assists: {player_data.assists}, Team Kills: {player_data.team_kills}\n")
+            parts.append(f"  Score: {player_data.score}, Capture Zones: {player_data.capture_zone}\n")
+            parts.append(f"  Lineup: {', '.join(player_data.lineup[:3])}" + 
+                         (f" (+{len(player_data.lineup)-3} more)" if len(player_data.lineup) > 3 else "") + "\n")
+        
+        _write_atomic(output_file, "".join(parts).encode('utf-8'))
         return True
     
     def _export_debug(self, replay_data: ReplayData, output_file: Path) -> bool:
         """Export debug information including raw BLK data"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("WRPL File Debug Information\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Full header dump
-            f.write("[ FULL HEADER DUMP ]\n")
-            f.write("-" * 80 + "\n")
-            f.write(json.dumps(asdict(replay_data.header), indent=2, default=str))
-            
-            # BLK data structure
-            f.write("\n\n[ BLK DATA STRUCTURE ]\n")
-            f.write("-" * 80 + "\n")
-            self._write_json_structure(replay_data.blk_data, f, depth=0)
+        parts: List[str] = []
+        parts.append("=" * 80 + "\n")
+        parts.append("WRPL File Debug Information\n")
+        parts.append("=" * 80 + "\n\n")
+        
+        # Full header dump
+        parts.append("[ FULL HEADER DUMP ]\n")
+        parts.append("-" * 80 + "\n")
+        parts.append(_json_dumps(_shallow_dict(replay_data.header)).decode('utf-8'))
+        
+        # BLK data structure
+        if not replay_data.header_only:
+            parts.append("\n\n[ BLK DATA STRUCTURE ]\n")
+            parts.append("-" * 80 + "\n")
+            self._write_json_structure(replay_data.blk_data, parts, depth=0)
+        
+        _write_atomic(output_file, "".join(parts).encode('utf-8'))
+        return True
     
     def _players_to_dict(self, players: List[Tuple[Player, PlayerReplayData]]) -> List[Dict]:
         """Convert players list to serializable dict"""
         result = []
         for player, player_data in players:
             result.append({
-                'player': asdict(player),
-                'player_data': asdict(player_data)
+                'player': _shallow_dict(player),
+                'player_data': _shallow_dict(player_data)
             })
         return result
     
-    def _write_json_structure(self, data: Any, f, depth: int = 0, max_depth: int = 3):
-        """Write JSON structure with limited depth"""
+    def _write_json_structure(self, data: Any, parts: List[str], depth: int = 0, max_depth: int = 3):
+        """Append JSON structure lines to parts with limited depth"""
         indent = "  " * depth
         
         if depth >= max_depth:
-            f.write(f"{indent}... (truncated at depth {max_depth})\n")
+            parts.append(f"{indent}... (truncated at depth {max_depth})\n")
             return
         
         if isinstance(data, dict):
             for key, value in data.items():
                 if isinstance(value, (dict, list)):
-                    f.write(f"{indent}{key}: {type(value).__name__}\n")
-                    self._write_json_structure(value, f, depth + 1, max_depth)
+                    parts.append(f"{indent}{key}: {type(value).__name__}\n")
+                    self._write_json_structure(value, parts, depth + 1, max_depth)
                 else:
-                    f.write(f"{indent}{key}: {type(value).__name__} = {repr(value)[:100]}\n")
+                    parts.append(f"{indent}{key}: {type(value).__name__} = {repr(value)[:100]}\n")
         elif isinstance(data, list):
-            f.write(f"{indent}List[{len(data)} items]:\n")
+            parts.append(f"{indent}List[{len(data)} items]:\n")
             for i, item in enumerate(data[:5]):  # Limit to 5 items
-                f.write(f"{indent}[{i}]: {type(item).__name__}\n")
-                self._write_json_structure(item, f, depth + 1, max_depth)
+                parts.append(f"{indent}[{i}]: {type(item).__name__}\n")
+                self._write_json_structure(item, parts, depth + 1, max_depth)
             if len(data) > 5:
-                f.write(f"{indent}... (+{len(data) - 5} more items)\n")
+                parts.append(f"{indent}... (+{len(data) - 5} more items)\n")
         else:
-            f.write(f"{indent}{type(data).__name__}: {repr(data)[:200]}\n")
+            parts.append(f"{indent}{type(data).__name__}: {repr(data)[:200]}\n")
 
 
 # ============================================================================
@@ -803,18 +915,16 @@ def setup_logging(verbose: bool = False) -> None:
 
 
 def process_single_file(file_path: Path, wt_ext_cli_path: Path, 
-                       output_format: str) -> bool:
+                       output_format: str, header_only: bool = False) -> bool:
     """Process a single WRPL file"""
-    logger = logging.getLogger(__name__)
-    
-    logger.info(f"Processing: {file_path.name}")
+    _LOG.info("Processing: %s", file_path.name)
     
     # Parse file
     parser = ReplayParser(file_path, wt_ext_cli_path)
-    replay_data = parser.parse()
+    replay_data = parser.parse(needs_blk=not header_only)
     
     if not replay_data:
-        logger.error(f"Failed to parse {file_path.name}")
+        _LOG.error("Failed to parse %s", file_path.name)
         return False
     
     # Export results
@@ -822,34 +932,67 @@ def process_single_file(file_path: Path, wt_ext_cli_path: Path,
     output_file = file_path.with_suffix(f'.{output_format}')
     
     if exporter.export(replay_data, output_file):
-        logger.info(f"Successfully exported to: {output_file}")
+        _LOG.info("Successfully exported to: %s", output_file)
         return True
     else:
-        logger.error(f"Failed to export {file_path.name}")
+        _LOG.error("Failed to export %s", file_path.name)
         return False
 
 
-def process_directory(directory_path: Path, wt_ext_cli_path: Path,
-                     output_format: str) -> None:
-    """Process all WRPL files in a directory"""
-    logger = logging.getLogger(__name__)
+def _process_file_in_worker(file_path: Path, **kwargs: Any) -> bool:
+    """process_single_file for pool workers; exits the worker on Ctrl-C
     
-    wrpl_files = list(directory_path.glob("*.wrpl"))
+    Ctrl-C reaches every worker in the process group. Exiting (after cleanup
+    in finally blocks has run) breaks the pool, so workers don't go on to
+    start replays that were already queued to them.
+    """
+    try:
+        return process_single_file(file_path, **kwargs)
+    except KeyboardInterrupt:
+        os._exit(130)
+
+
+def process_directory(directory_path: Path, wt_ext_cli_path: Path,
+                     output_format: str, jobs: Optional[int] = None,
+                     header_only: bool = False) -> None:
+    """Process all WRPL files in a directory (files are parsed in parallel)"""
+    # scandir reuses the file type from readdir instead of stat-ing every entry
+    with os.scandir(directory_path) as entries:
+        wrpl_files = [Path(entry.path) for entry in entries
+                      if entry.name.lower().endswith('.wrpl') and entry.is_file()]
     
     if not wrpl_files:
-        logger.warning(f"No .wrpl files found in {directory_path}")
+        _LOG.warning("No .wrpl files found in %s", directory_path)
         return
     
-    logger.info(f"Found {len(wrpl_files)} replay files in {directory_path}")
+    _LOG.info("Found %d replay files in %s", len(wrpl_files), directory_path)
+    
+    # Each file is independent and mostly waits on wt_ext_cli, so fan out
+    # across processes. Workers re-apply the logging setup in case they are
+    # spawned rather than forked.
+    max_workers = min(jobs or os.cpu_count() or 1, len(wrpl_files))
+    if sys.platform == 'win32':
+        max_workers = min(max_workers, _MAX_WINDOWS_WORKERS)
+    verbose = logging.getLogger().isEnabledFor(logging.DEBUG)
+    worker = partial(_process_file_in_worker, wt_ext_cli_path=wt_ext_cli_path,
+                     output_format=output_format, header_only=header_only)
     
     success_count = 0
-    for idx, wrpl_file in enumerate(wrpl_files, 1):
-        logger.info(f"[{idx}/{len(wrpl_files)}] Processing {wrpl_file.name}")
-        
-        if process_single_file(wrpl_file, wt_ext_cli_path, output_format):
-            success_count += 1
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=setup_logging,
+                             initargs=(verbose,)) as executor:
+        try:
+            results = executor.map(worker, wrpl_files)
+            for idx, (wrpl_file, success) in enumerate(zip(wrpl_files, results), 1):
+                _LOG.info("[%d/%d] Finished %s", idx, len(wrpl_files), wrpl_file.name)
+                
+                if success:
+                    success_count += 1
+        except KeyboardInterrupt:
+            # Drop queued replays instead of letting workers keep processing them
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
     
-    logger.info(f"Processing complete. Successful: {success_count}/{len(wrpl_files)}")
+    _LOG.info("Processing complete. Successful: %d/%d", success_count, len(wrpl_files))
 
 
 def main() -> None:
@@ -862,6 +1005,8 @@ Examples:
   %(prog)s replay.wrpl
   %(prog)s replays/ --wt_ext_cli ./wt_ext_cli --format txt
   %(prog)s replays/ --verbose --format debug
+  %(prog)s replays/ --jobs 4
+  %(prog)s replays/ --header-only --format txt
 
 The wt_ext_cli tool is required and can be downloaded from:
 https://github.com/Warthunder-Open-Source-Foundation/wt_ext_cli
@@ -888,6 +1033,19 @@ https://github.com/Warthunder-Open-Source-Foundation/wt_ext_cli
         help='Output format (default: json)'
     )
     
+    parser.add_argument(
+        '--header-only',
+        action='store_true',
+        help='Only read the replay header (skips wt_ext_cli; no player/BLK data)'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Worker processes for directory mode (default: number of CPUs)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -897,33 +1055,41 @@ https://github.com/Warthunder-Open-Source-Foundation/wt_ext_cli
     args = parser.parse_args()
     setup_logging(args.verbose)
     
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.jobs is not None and sys.platform == 'win32' and args.jobs > _MAX_WINDOWS_WORKERS:
+        parser.error(f"--jobs can be at most {_MAX_WINDOWS_WORKERS} on Windows")
+    
     # Validate inputs
     if not args.path.exists():
-        logging.error(f"Path does not exist: {args.path}")
+        logging.error("Path does not exist: %s", args.path)
         sys.exit(1)
     
     wt_ext_cli_path = args.wt_ext_cli.resolve()
-    if not wt_ext_cli_path.exists():
-        logging.error(f"wt_ext_cli not found at {wt_ext_cli_path}")
+    if not args.header_only and not wt_ext_cli_path.exists():
+        logging.error("wt_ext_cli not found at %s", wt_ext_cli_path)
         sys.exit(1)
     
     # Process files
     try:
         if args.path.is_file():
             if args.path.suffix.lower() != '.wrpl':
-                logging.error(f"File must have .wrpl extension: {args.path}")
+                logging.error("File must have .wrpl extension: %s", args.path)
                 sys.exit(1)
-            success = process_single_file(args.path, wt_ext_cli_path, args.format)
+            success = process_single_file(args.path, wt_ext_cli_path, args.format,
+                                          args.header_only)
             sys.exit(0 if success else 1)
         else:
-            process_directory(args.path, wt_ext_cli_path, args.format)
+            process_directory(args.path, wt_ext_cli_path, args.format, args.jobs,
+                              args.header_only)
             
     except KeyboardInterrupt:
         logging.info("Processing interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logging.error(f"Fatal error: {e}")
-        logging.debug(f"Traceback:\n{traceback.format_exc()}")
+        logging.error("Fatal error: %s", e)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Traceback:\n%s", traceback.format_exc())
         sys.exit(1)
 
 